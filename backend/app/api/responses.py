@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import os
+import re
+import stat
+from typing import Any, BinaryIO, Optional
+
+import anyio
+import orjson
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+ZEROCOPY_SEND_EXTENSION = "http.response.zerocopysend"
+# RFC 9110 range fields are plain digits; int() alone would also take "+1", "1_0" or "-5".
+_BYTE_RANGE_RE = re.compile(r"([0-9]*)-([0-9]*)")
+# OPT_UTC_Z writes UTC datetimes as `...Z`, the same form Pydantic models produce.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class UTCJSONResponse(ORJSONResponse):
+    """ORJSONResponse whose datetimes match the Pydantic-encoded views."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a byte range starts beyond the end of the file."""
+
+
+class ZeroCopyFileResponse(FileResponse):
+    """File response that lets the server `sendfile(2)` the artifact when supported.
+
+    Servers advertising the ASGI ``http.response.zerocopysend`` extension receive
+    the open file and copy it to the socket in the kernel. Everything else falls
+    back to reading chunks in a worker thread. Single ``bytes=`` ranges are
+    honoured so interrupted downloads can resume.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        file, stat_result = await anyio.to_thread.run_sync(_open_regular_file, self.path)
+        try:
+            self.set_stat_headers(stat_result)
+            self.headers["accept-ranges"] = "bytes"
+            size = stat_result.st_size
+            offset, count = 0, size
+
+            range_header = Headers(scope=scope).get("range")
+            if range_header:
+                try:
+                    byte_range = parse_byte_range(range_header, size)
+                except RangeNotSatisfiable:
+                    await self._send_not_satisfiable(size, send)
+                    return
+                if byte_range is not None:
+                    offset, count = byte_range
+                    self.status_code = 206
+                    self.headers["content-range"] = f"bytes {offset}-{offset + count - 1}/{size}"
+                    self.headers["content-length"] = str(count)
+
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": self.raw_headers,
+                }
+            )
+            extensions = scope.get("extensions") or {}
+            if scope["method"].upper() == "HEAD":
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+            elif ZEROCOPY_SEND_EXTENSION in extensions:
+                await send(
+                    {
+                        "type": ZEROCOPY_SEND_EXTENSION,
+                        "file": file,
+                        "offset": offset,
+                        "count": count,
+                        "more_body": False,
+                    }
+                )
+            else:
+                await self._send_chunks(file, offset, count, send)
+        finally:
+            file.close()
+
+        if self.background is not None:
+            await self.background()
+
+    async def _send_chunks(self, file: BinaryIO, offset: int, count: int, send: Send) -> None:
+        fd = file.fileno()
+        remaining = count
+        while True:
+            chunk = await anyio.to_thread.run_sync(os.pread, fd, min(self.chunk_size, remaining), offset)
+            offset += len(chunk)
+            remaining -= len(chunk)
+            more_body = bool(chunk) and remaining > 0
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+            if not more_body:
+                return
+
+    async def _send_not_satisfiable(self, size: int, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 416,
+                "headers": [
+                    (b"content-range", f"bytes */{size}".encode("latin-1")),
+                    (b"content-length", b"0"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def parse_byte_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """Return `(offset, count)` for a single byte range, or None to send the whole file.
+
+    Multi-range and malformed headers are ignored, as RFC 9110 allows.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    match = _BYTE_RANGE_RE.fullmatch(spec.strip())
+    if match is None:
+        return None
+    start_text, end_text = match.groups()
+    if not start_text:
+        if not end_text:
+            return None
+        suffix = int(end_text)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiable
+        return max(size - suffix, 0), min(suffix, size)
+    start = int(start_text)
+    end = int(end_text) if end_text else size - 1
+    if end_text and end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    end = min(end, size - 1)
+    return start, end - start + 1
+
+
+def _open_regular_file(path: str | os.PathLike[str]) -> tuple[BinaryIO, os.stat_result]:
+    try:
+        file = open(path, "rb")
+    except FileNotFoundError as exc:
+        raise RuntimeError(f"File at path {path} does not exist.") from exc
+    stat_result = os.fstat(file.fileno())
+    if not stat.S_ISREG(stat_result.st_mode):
+        file.close()
+        raise RuntimeError(f"File at path {path} is not a file.")
+    return file, stat_result
@@ -1,16 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Optional
-from urllib.parse import urlsplit, urlunsplit
+from typing import AsyncIterator, Optional
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
-from fastapi.responses import FileResponse
-
+from fastapi.responses import StreamingResponse
 from ...core.config import Settings
 from ...dependencies import (
-    get_app_settings,
     get_executor,
     get_job_store,
     get_rip_runner,
@@ -31,10 +30,10 @@ from ...models.job import (
 from ...services.job_store import JobStore
 from ...services.rip_runner import RipRunner
 from ...services.token_store import TokenStore
+from ..responses import ORJSON_OPTIONS, UTCJSONResponse, ZeroCopyFileResponse
 
 router = APIRouter(prefix="/v1/rips", tags=["rips"])
 
-
 def _raise_error(status_code: int, code: str, message: str) -> None:
     raise HTTPException(
         status_code=status_code,
@@ -53,9 +52,9 @@ async def create_rip_job(
     job_store: JobStore = Depends(get_job_store),
     executor: ThreadPoolExecutor = Depends(get_executor),
     runner: RipRunner = Depends(get_rip_runner),
-    settings: Settings = Depends(get_app_settings),
     session_id: str = Depends(get_or_create_session_id),
 ) -> CreateRipResponse:
+    settings: Settings = request.app.state.settings  # type: ignore[attr-defined]
     if job_store.active_count() >= settings.queue_limit:
         _raise_error(status.HTTP_429_TOO_MANY_REQUESTS, "TOO_MANY_JOBS", "Job queue is full, try again later")
 
@@ -68,23 +67,22 @@ async def create_rip_job(
         )
 
     normalized_payload = payload.normalize()
-    job = job_store.create(str(normalized_payload.theme_url), session_id=session_id)
+    initial_logs = []
     if normalized_payload.theme_url != payload.theme_url:
-        job_store.append_log(job.job_id, "info", "Normalized submitted URL to preview")
-    job_store.append_log(job.job_id, "info", "Job queued")
+        initial_logs.append(("info", "Normalized submitted URL to preview"))
+    initial_logs.append(("info", "Job queued"))
+    job = job_store.create_with_logs(normalized_payload.theme_url, session_id, initial_logs)
 
     def task() -> None:
         try:
-            runner.run(job.job_id, str(normalized_payload.theme_url))
+            runner.run(job.job_id, normalized_payload.theme_url)
         except Exception:
             # Errors already recorded in job store; swallow to avoid choking executor.
             pass
 
     executor.submit(task)
 
-    snapshot = job_store.snapshot(job.job_id)
-    assert snapshot is not None
-    return CreateRipResponse(data=_to_job_view(snapshot, request))
+    return CreateRipResponse(data=_to_job_view(job, request, datetime.now(tz=timezone.utc)))
 
 
 @router.get(
@@ -94,16 +92,23 @@ async def create_rip_job(
 async def get_job(
     job_id: str,
     request: Request,
+    response: Response,
     job_store: JobStore = Depends(get_job_store),
-    settings: Settings = Depends(get_app_settings),
     session_id: str = Depends(get_or_create_session_id),
-) -> JobResponse:
-    job = job_store.snapshot(job_id)
-    if job is None:
-        _raise_error(status.HTTP_404_NOT_FOUND, "JOB_NOT_FOUND", f"Job {job_id} not found")
-    if job.session_id != session_id:
-        _raise_error(status.HTTP_404_NOT_FOUND, "JOB_NOT_FOUND", f"Job {job_id} not found")
-    return JobResponse(data=_to_job_view(job, request))
+) -> Response:
+    now = datetime.now(tz=timezone.utc)
+    origin = _public_origin(request)
+    body = job_store.cached_view(job_id, session_id, origin, now)
+    if body is None:
+        job = job_store.snapshot(job_id)
+        if job is None:
+            _raise_error(status.HTTP_404_NOT_FOUND, "JOB_NOT_FOUND", f"Job {job_id} not found")
+        if job.session_id != session_id:
+            _raise_error(status.HTTP_404_NOT_FOUND, "JOB_NOT_FOUND", f"Job {job_id} not found")
+        view = _to_job_view(job, request, now)
+        body = JobResponse(data=view).model_dump_json().encode()
+        job_store.cache_view(job, origin, body, job.expires_at if view.download_url else None)
+    return _carry_session_cookie(Response(content=body, media_type="application/json"), response)
 
 
 @router.get(
@@ -112,10 +117,11 @@ async def get_job(
 )
 async def get_job_logs(
     job_id: str,
+    response: Response,
     since: int = Query(default=0, ge=0),
     job_store: JobStore = Depends(get_job_store),
     session_id: str = Depends(get_or_create_session_id),
-) -> JobLogsResponse:
+) -> UTCJSONResponse:
     snapshot = job_store.snapshot(job_id)
     if snapshot is None:
         _raise_error(status.HTTP_404_NOT_FOUND, "JOB_NOT_FOUND", f"Job {job_id} not found")
@@ -123,25 +129,52 @@ async def get_job_logs(
         _raise_error(status.HTTP_404_NOT_FOUND, "JOB_NOT_FOUND", f"Job {job_id} not found")
 
     entries, next_cursor, has_more = job_store.get_logs_since(job_id, since)
-    return JobLogsResponse(
-        data={
+    # LogEntry is a dataclass orjson encodes natively; skip the DTO round-trip.
+    content = {
+        "data": {
             "job_id": job_id,
-            "entries": [_to_log_entry(e) for e in entries],
+            "entries": entries,
             "next_cursor": next_cursor,
             "has_more": has_more,
         }
+    }
+    return _carry_session_cookie(UTCJSONResponse(content=content), response)
+
+
+@router.get(
+    "/{job_id}/logs/stream",
+    response_class=StreamingResponse,
+)
+async def stream_job_logs(
+    job_id: str,
+    response: Response,
+    since: int = Query(default=0, ge=0),
+    job_store: JobStore = Depends(get_job_store),
+    session_id: str = Depends(get_or_create_session_id),
+) -> StreamingResponse:
+    snapshot = job_store.snapshot(job_id)
+    if snapshot is None:
+        _raise_error(status.HTTP_404_NOT_FOUND, "JOB_NOT_FOUND", f"Job {job_id} not found")
+    if snapshot.session_id != session_id:
+        _raise_error(status.HTTP_404_NOT_FOUND, "JOB_NOT_FOUND", f"Job {job_id} not found")
+
+    stream = StreamingResponse(
+        _iter_log_lines(job_store, job_id, since),
+        media_type="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"},
     )
+    return _carry_session_cookie(stream, response)
 
 
 @router.get(
     "/{job_id}/download",
-    response_class=FileResponse,
+    response_class=ZeroCopyFileResponse,
 )
 async def download_job_artifact(
     job_id: str,
     job_store: JobStore = Depends(get_job_store),
     session_id: str = Depends(get_or_create_session_id),
-) -> FileResponse:
+) -> ZeroCopyFileResponse:
     job = job_store.snapshot(job_id)
     if job is None:
         _raise_error(status.HTTP_404_NOT_FOUND, "JOB_NOT_FOUND", f"Job {job_id} not found")
@@ -152,7 +185,7 @@ async def download_job_artifact(
     if job.expires_at and job.expires_at < datetime.now(tz=timezone.utc):
         _raise_error(status.HTTP_404_NOT_FOUND, "JOB_NOT_FOUND", "Download link has expired")
 
-    return FileResponse(
+    return ZeroCopyFileResponse(
         path=job.artifact_path,
         media_type="application/zip",
         filename=f"{job.job_id}.zip",
@@ -183,13 +216,13 @@ async def cancel_job(
 
 @router.get(
     "/downloads/{token}",
-    response_class=FileResponse,
+    response_class=ZeroCopyFileResponse,
 )
 async def download_job_by_token(
     token: str,
     token_store: TokenStore = Depends(get_token_store),
     job_store: JobStore = Depends(get_job_store),
-) -> FileResponse:
+) -> ZeroCopyFileResponse:
     resolved = token_store.resolve(token)
     if resolved is None:
         _raise_error(status.HTTP_404_NOT_FOUND, "DOWNLOAD_NOT_FOUND", "Download link is invalid or expired")
@@ -201,29 +234,54 @@ async def download_job_by_token(
     if expires_at < datetime.now(tz=timezone.utc):
         token_store.delete_token(token)
         _raise_error(status.HTTP_404_NOT_FOUND, "DOWNLOAD_NOT_FOUND", "Download link has expired")
-    return FileResponse(
+    return ZeroCopyFileResponse(
         path=job.artifact_path,
         media_type="application/zip",
         filename=f"{job.job_id}.zip",
     )
 
 
-LOG_TAIL_LIMIT = 50
+LOG_STREAM_POLL_SECONDS = 0.5
+TERMINAL_STATUSES = frozenset({JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED})
 
 
-def _to_job_view(job: Job, request: Request) -> JobView:
-    entries = job.logs[-LOG_TAIL_LIMIT:]
+async def _iter_log_lines(job_store: JobStore, job_id: str, cursor: int) -> AsyncIterator[bytes]:
+    while True:
+        # Read the status before the logs so entries written up to a terminal
+        # transition are flushed before the stream closes.
+        job_status = job_store.get_status(job_id)
+        if job_status is None:
+            return
+        try:
+            entries, cursor, _ = job_store.get_logs_since(job_id, cursor)
+        except KeyError:
+            return
+        if entries:
+            yield b"".join(orjson.dumps(entry, option=ORJSON_OPTIONS) + b"\n" for entry in entries)
+        if job_status in TERMINAL_STATUSES:
+            return
+        await asyncio.sleep(LOG_STREAM_POLL_SECONDS)
+
+
+def _carry_session_cookie(target: Response, sub_response: Response) -> Response:
+    # FastAPI drops headers set on the injected response when a route returns
+    # its own Response, so copy the session cookie over explicitly.
+    for value in sub_response.headers.getlist("set-cookie"):
+        target.headers.append("set-cookie", value)
+    return target
+
+
+def _to_job_view(job: Job, request: Request, now: datetime) -> JobView:
     next_cursor = job.next_cursor
-    log_entries = [_to_log_entry(entry) for entry in entries]
+    log_entries = [_to_log_entry(entry) for entry in job.log_tail]
     download_url: Optional[str] = None
     if (
         job.status == JobStatus.SUCCEEDED
         and job.artifact_path is not None
         and job.download_token
-        and (job.expires_at is None or job.expires_at > datetime.now(tz=timezone.utc))
+        and (job.expires_at is None or job.expires_at > now)
     ):
-        raw_url = str(request.url_for("download_job_by_token", token=job.download_token))
-        download_url = _apply_forwarded_headers(raw_url, request)
+        download_url = _download_url(request, job.download_token)
 
     return JobView(
         job_id=job.job_id,
@@ -248,16 +306,15 @@ def _to_log_entry(entry) -> LogEntryDTO:
     )
 
 
-def _apply_forwarded_headers(url: str, request: Request) -> str:
-    forwarded_proto = request.headers.get("x-forwarded-proto")
-    forwarded_host = request.headers.get("x-forwarded-host")
-
-    if not forwarded_proto and not forwarded_host:
-        return url
-
-    parsed = urlsplit(url)
-    scheme = forwarded_proto or parsed.scheme
-    netloc = forwarded_host or parsed.netloc
-    return urlunsplit((scheme, netloc, parsed.path, parsed.query, parsed.fragment))
+def _public_origin(request: Request) -> str:
+    # Built from base_url rather than request.url_for to skip the router walk;
+    # proxy headers only ever replace the scheme and host.
+    base_url = request.base_url
+    scheme = request.headers.get("x-forwarded-proto") or base_url.scheme
+    netloc = request.headers.get("x-forwarded-host") or base_url.netloc
+    return f"{scheme}://{netloc}{base_url.path}"
 
 
+def _download_url(request: Request, token: str) -> str:
+    template: str = request.app.state.download_path_template  # type: ignore[attr-defined]
+    return f"{_public_origin(request)}{template.format(token=token)}"
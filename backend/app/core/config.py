@@ -1,3 +1,4 @@
+import secrets
 from functools import lru_cache
 from pathlib import Path
 
@@ -45,6 +46,25 @@ class Settings(BaseSettings):
         default=True,
         description="Run Chrome in headless mode when true.",
     )
+    max_concurrent_drivers: int = Field(
+        default=2,
+        ge=1,
+        le=8,
+        description="Maximum headless Chrome instances; idle ones are kept warm for the next job.",
+    )
+    thread_pool_tokens: int | None = Field(
+        default=None,
+        ge=1,
+        description=(
+            "Worker-thread tokens for anyio's default pool, shared by file downloads "
+            "and sync dependencies. Derived from max_workers and queue_limit when unset."
+        ),
+    )
+    session_secret: str = Field(
+        default_factory=lambda: secrets.token_hex(32),
+        min_length=16,
+        description="Key used to sign session cookies. Random per process when unset.",
+    )
     token_db_path: Path = Field(
         default=Path(__file__).resolve().parents[2] / "storage" / "tokens.db",
         description="SQLite database path for download tokens.",
@@ -1,21 +1,19 @@
 from __future__ import annotations
 
 from concurrent.futures import ThreadPoolExecutor
-import secrets
-from typing import Final
+import hashlib
+import hmac
+import os
+from threading import Lock
+from typing import Final, Optional
 
 from fastapi import Request, Response
 
-from .core.config import Settings, get_settings
 from .services.job_store import JobStore
 from .services.rip_runner import RipRunner
 from .services.token_store import TokenStore
 
 
-def get_app_settings() -> Settings:
-    return get_settings()
-
-
 def get_job_store(request: Request) -> JobStore:
     return request.app.state.job_store  # type: ignore[attr-defined]
 
@@ -34,16 +32,43 @@ def get_token_store(request: Request) -> TokenStore:
 
 SESSION_COOKIE_NAME: Final[str] = "theme_ripper_session"
 SESSION_COOKIE_MAX_AGE: Final[int] = 60 * 60 * 24 * 30  # 30 days
+SESSION_ID_BYTES: Final[int] = 32
+SESSION_MAC_LENGTH: Final[int] = 16
+
+
+class _EntropyBuffer:
+    """Hands out slices of one large os.urandom read instead of a syscall per session."""
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._buffer = b""
+        self._offset = 0
+        self._lock = Lock()
+
+    def take(self, count: int) -> bytes:
+        with self._lock:
+            if self._offset + count > len(self._buffer):
+                self._buffer = os.urandom(self._size)
+                self._offset = 0
+            chunk = self._buffer[self._offset : self._offset + count]
+            self._offset += count
+            return chunk
+
+
+_entropy = _EntropyBuffer(4096)
 
 
 def get_or_create_session_id(request: Request, response: Response) -> str:
-    session_id = request.cookies.get(SESSION_COOKIE_NAME)
-    if session_id is None or not _is_valid_session_id(session_id):
-        session_id = secrets.token_urlsafe(32)
+    secret = request.app.state.settings.session_secret.encode()  # type: ignore[attr-defined]
+    cookie_value = request.cookies.get(SESSION_COOKIE_NAME)
+    session_id = _verify_session_cookie(cookie_value, secret)
+    if session_id is None:
+        session_id = _entropy.take(SESSION_ID_BYTES).hex()
+        cookie_value = f"{session_id}.{_sign_session_id(session_id, secret)}"
     secure_cookie = request.url.scheme == "https"
     response.set_cookie(
         key=SESSION_COOKIE_NAME,
-        value=session_id,
+        value=cookie_value,
         httponly=True,
         secure=secure_cookie,
         samesite="lax",
@@ -52,10 +77,15 @@ def get_or_create_session_id(request: Request, response: Response) -> str:
     return session_id
 
 
-def _is_valid_session_id(value: str) -> bool:
-    if not value:
-        return False
-    # Basic length guard to avoid unbounded cookie values
-    return len(value) <= 256
+def _sign_session_id(session_id: str, secret: bytes) -> str:
+    return hmac.new(secret, session_id.encode(), hashlib.sha256).hexdigest()[:SESSION_MAC_LENGTH]
 
 
+def _verify_session_cookie(value: Optional[str], secret: bytes) -> Optional[str]:
+    # Basic length guard to avoid unbounded cookie values
+    if not value or len(value) > 256:
+        return None
+    session_id, separator, mac = value.rpartition(".")
+    if not separator or not hmac.compare_digest(mac, _sign_session_id(session_id, secret)):
+        return None
+    return session_id
@@ -3,6 +3,7 @@ from __future__ import annotations
 from concurrent.futures import ThreadPoolExecutor
 import shutil
 
+import anyio.to_thread
 from fastapi import FastAPI
 
 def _purge_previous_state(settings: Settings) -> None:
@@ -15,13 +16,17 @@ def _purge_previous_state(settings: Settings) -> None:
                     child.unlink(missing_ok=False)
                 except FileNotFoundError:
                     pass
-    if settings.token_db_path.exists():
-        try:
-            settings.token_db_path.unlink()
-        except FileNotFoundError:
-            pass
+    # WAL mode keeps -wal/-shm companions next to the database.
+    for suffix in ("", "-wal", "-shm"):
+        db_file = settings.token_db_path.with_name(settings.token_db_path.name + suffix)
+        if db_file.exists():
+            try:
+                db_file.unlink()
+            except FileNotFoundError:
+                pass
 
 
+from .api.responses import UTCJSONResponse
 from .api.routes import rips
 from .core.config import Settings, ensure_directories, get_settings
 from .services.cleanup import CleanupThread
@@ -30,6 +35,12 @@ from .services.rip_runner import RipRunner
 from .services.token_store import TokenStore
 
 
+def _thread_pool_tokens(settings: Settings) -> int:
+    if settings.thread_pool_tokens is not None:
+        return settings.thread_pool_tokens
+    return max(100, settings.max_workers * 8 + settings.queue_limit * 2)
+
+
 def create_app() -> FastAPI:
     settings = get_settings()
     _purge_previous_state(settings)
@@ -38,11 +49,13 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title="Theme Ripper API",
         version="0.1.0",
+        default_response_class=UTCJSONResponse,
     )
 
     token_store = TokenStore(settings.token_db_path)
     job_store = JobStore(settings.job_log_limit, settings.job_ttl_seconds, token_store)
-    executor = ThreadPoolExecutor(max_workers=settings.max_workers)
+    executor = ThreadPoolExecutor(max_workers=settings.max_workers, thread_name_prefix="rip")
+    thread_pool_tokens = _thread_pool_tokens(settings)
     rip_runner = RipRunner(settings, job_store)
     cleanup_thread = CleanupThread(settings, job_store)
     cleanup_thread.start()
@@ -55,15 +68,25 @@ def create_app() -> FastAPI:
     app.state.token_store = token_store  # type: ignore[attr-defined]
 
     app.include_router(rips.router)
+    # Resolved once so job views can build download links without a router lookup.
+    app.state.download_path_template = app.url_path_for(  # type: ignore[attr-defined]
+        "download_job_by_token", token="{token}"
+    ).lstrip("/")
 
     @app.get("/healthz")
     async def healthcheck() -> dict[str, str]:
         return {"status": "ok"}
 
+    @app.on_event("startup")
+    async def configure_thread_pool() -> None:
+        # The limiter is bound to the running event loop, so it can only be resized here.
+        anyio.to_thread.current_default_thread_limiter().total_tokens = thread_pool_tokens
+
     @app.on_event("shutdown")
     def shutdown() -> None:
         executor.shutdown(wait=True, cancel_futures=True)
         cleanup_thread.stop()
+        rip_runner.close()
 
     return app
 
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
 from typing import Optional
 
-from pydantic import BaseModel, HttpUrl, model_validator
-from urllib.parse import urlparse
+from pydantic import BaseModel, Field, HttpUrl, field_validator
+from pydantic_core import Url
+from pydantic_core import ValidationError as PydanticCoreValidationError
+from urllib.parse import urlsplit
 
 
 class JobStatus(str, Enum):
@@ -18,8 +21,18 @@ class JobStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass(slots=True)
+LOG_TAIL_LIMIT = 50
+
+
+def utc_from_ns(timestamp_ns: int) -> datetime:
+    """Convert a `time.time_ns()` reading to an aware UTC datetime."""
+    return datetime.fromtimestamp(timestamp_ns / 1_000_000_000, tz=timezone.utc)
+
+
+@dataclass(slots=True, frozen=True)
 class LogEntry:
+    """A single log line. Immutable, so snapshots share entries instead of copying them."""
+
     cursor: int
     timestamp: datetime
     level: str
@@ -33,8 +46,10 @@ class Job:
     session_id: str
     status: JobStatus
     created_at: datetime
-    updated_at: datetime
-    logs: list[LogEntry] = field(default_factory=list)
+    # Raw `time.time_ns()`; hot paths only read the clock, the datetime is built on demand.
+    updated_at_ns: int
+    logs: deque[LogEntry] = field(default_factory=deque)
+    log_tail: deque[LogEntry] = field(default_factory=lambda: deque(maxlen=LOG_TAIL_LIMIT))
     next_cursor: int = 0
     artifact_path: Optional[Path] = None
     download_size: Optional[int] = None
@@ -43,24 +58,66 @@ class Job:
     download_token: Optional[str] = None
     cancel_requested: bool = False
 
+    def _fast_clone(self) -> "Job":
+        """Copy for snapshots: containers are copied, log entries and immutable fields shared."""
+        return Job(
+            job_id=self.job_id,
+            theme_url=self.theme_url,
+            session_id=self.session_id,
+            status=self.status,
+            created_at=self.created_at,
+            updated_at_ns=self.updated_at_ns,
+            logs=self.logs.copy(),
+            log_tail=self.log_tail.copy(),
+            next_cursor=self.next_cursor,
+            artifact_path=self.artifact_path,
+            download_size=self.download_size,
+            error=self.error,
+            expires_at=self.expires_at,
+            download_token=self.download_token,
+            cancel_requested=self.cancel_requested,
+        )
+
+    @property
+    def updated_at(self) -> datetime:
+        return utc_from_ns(self.updated_at_ns)
+
 
 THEME_HOST_ALLOWLIST = ("themeforest.net", "preview.themeforest.net")
 
 
-class CreateRipRequest(BaseModel):
-    theme_url: HttpUrl
+def _is_theme_host(host: str) -> bool:
+    # Match whole labels so look-alikes such as `evilthemeforest.net` are rejected.
+    return any(host == domain or host.endswith("." + domain) for domain in THEME_HOST_ALLOWLIST)
 
-    @model_validator(mode="after")
-    def validate_host(cls, data: "CreateRipRequest") -> "CreateRipRequest":
-        host = data.theme_url.host
-        if host is None or not any(host.endswith(domain) for domain in THEME_HOST_ALLOWLIST):
+
+class CreateRipRequest(BaseModel):
+    theme_url: str = Field(max_length=2083)
+
+    @field_validator("theme_url")
+    @classmethod
+    def validate_theme_url(cls, value: str) -> str:
+        # Parse with the same WHATWG rules as Chrome and HttpUrl, and keep the canonical
+        # form: a lenient parser like urlsplit reads `https://evil.com\@themeforest.net/`
+        # as a themeforest.net URL, while the browser loads evil.com.
+        try:
+            url = Url(value.strip())
+        except PydanticCoreValidationError as exc:
+            raise ValueError("URL is malformed") from exc
+        host = url.host
+        if host is None or not _is_theme_host(host):
             raise ValueError("URL must belong to themeforest.net")
-        if data.theme_url.scheme != "https":
+        if url.scheme != "https":
             raise ValueError("URL must use https scheme")
-        return data
+        return str(url)
+
     def normalize(self) -> "CreateRipRequest":
-        parsed = urlparse(str(self.theme_url))
-        if parsed.netloc.endswith("themeforest.net") and "full_screen_preview" not in parsed.path:
+        url = self.theme_url
+        # Cheap substring test first: only item pages that aren't previews get rewritten.
+        if "/item/" not in url or "full_screen_preview" in url:
+            return self
+        parsed = urlsplit(url)
+        if _is_theme_host(parsed.hostname or "") and "full_screen_preview" not in parsed.path:
             segments = [segment for segment in parsed.path.split("/") if segment]
             try:
                 item_index = segments.index("item")
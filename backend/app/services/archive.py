@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Iterator, Optional
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile, ZipInfo
+
+# Already-compressed formats: deflating them again costs CPU for almost no size win.
+INCOMPRESSIBLE_SUFFIXES = frozenset(
+    {
+        ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico",
+        ".woff", ".woff2",
+        ".mp3", ".mp4", ".ogg", ".webm",
+        ".zip", ".gz", ".br",
+    }
+)
+ARCHIVE_COMPRESSLEVEL = 1
+# Larger files are streamed by ZipFile.write instead of being compressed in memory.
+PRECOMPRESS_MAX_BYTES = 8 * 1024 * 1024
+# Caps the compression threads per archive. With a window of two members per worker, a job
+# buffers at most ARCHIVE_MAX_WORKERS * 2 * PRECOMPRESS_MAX_BYTES of file data (64 MiB)
+# plus the compressed copies, however many cores the host has.
+ARCHIVE_MAX_WORKERS = 4
+# Fixed timestamp and mode for precompressed members: skips a stat and a localtime() per
+# file and makes archives of the same mirror byte-identical.
+ARCHIVE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+ARCHIVE_FILE_MODE = 0o644
+
+
+@dataclass(slots=True)
+class _PreparedMember:
+    path: str
+    info: ZipInfo
+    payload: Optional[bytes]
+
+
+def create_archive(archive_path: Path, source_dir: Path) -> None:
+    """Zip `source_dir` into `archive_path`, compressing members on a thread pool.
+
+    zlib releases the GIL, so members are deflated in parallel and only the
+    ordered writes into the archive happen on the calling thread.
+    """
+    workers = min(os.cpu_count() or 1, ARCHIVE_MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="zip") as pool, ZipFile(
+        archive_path,
+        mode="w",
+        compression=ZIP_DEFLATED,
+        compresslevel=ARCHIVE_COMPRESSLEVEL,
+    ) as zip_file:
+        # Keep a bounded window of members in flight so memory stays flat on large mirrors.
+        pending: Deque[Future[_PreparedMember]] = deque()
+        for path, arcname in _walk_files(source_dir):
+            pending.append(pool.submit(_prepare_member, path, arcname))
+            if len(pending) >= workers * 2:
+                _write_member(zip_file, pending.popleft().result())
+        while pending:
+            _write_member(zip_file, pending.popleft().result())
+
+
+def _walk_files(source_dir: Path) -> Iterator[tuple[str, str]]:
+    """Yield `(path, arcname)` for every regular file below `source_dir`.
+
+    `DirEntry.is_dir`/`is_file` use the type cached by scandir, so this costs no
+    stat per entry, unlike `rglob` plus `Path.is_file`. Symlinks are not followed.
+    """
+    root = os.fspath(source_dir)
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path, os.path.relpath(entry.path, root)
+
+
+def _compress_type(path: str) -> int:
+    suffix = os.path.splitext(path)[1].lower()
+    return ZIP_STORED if suffix in INCOMPRESSIBLE_SUFFIXES else ZIP_DEFLATED
+
+
+def _prepare_member(path: str, arcname: str) -> _PreparedMember:
+    info = ZipInfo(arcname, date_time=ARCHIVE_DATE_TIME)
+    info.compress_type = _compress_type(path)
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size > PRECOMPRESS_MAX_BYTES:
+            return _PreparedMember(path=path, info=info, payload=None)
+        data = file.read()
+    info.external_attr = ARCHIVE_FILE_MODE << 16
+    info.file_size = len(data)
+    info.CRC = zlib.crc32(data)
+    if info.compress_type == ZIP_DEFLATED:
+        compressor = zlib.compressobj(ARCHIVE_COMPRESSLEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+        data = compressor.compress(data) + compressor.flush()
+    info.compress_size = len(data)
+    return _PreparedMember(path=path, info=info, payload=data)
+
+
+def _write_member(zip_file: ZipFile, member: _PreparedMember) -> None:
+    if member.payload is None:
+        zip_file.write(member.path, member.info.filename, compress_type=member.info.compress_type)
+        return
+
+    # ZipFile has no public API for already-deflated data, so this mirrors
+    # ZipFile._open_to_write with the CRC and sizes known upfront. Members here
+    # are below PRECOMPRESS_MAX_BYTES, so they never need zip64 local headers.
+    info = member.info
+    with zip_file._lock:  # type: ignore[attr-defined]
+        zip_file.fp.seek(zip_file.start_dir)  # type: ignore[union-attr]
+        info.header_offset = zip_file.fp.tell()  # type: ignore[union-attr]
+        zip_file._writecheck(info)  # type: ignore[attr-defined]
+        zip_file._didModify = True  # type: ignore[attr-defined]
+        zip_file.fp.write(info.FileHeader(False))  # type: ignore[union-attr]
+        zip_file.fp.write(member.payload)  # type: ignore[union-attr]
+        zip_file.filelist.append(info)
+        zip_file.NameToInfo[info.filename] = info
+        zip_file.start_dir = zip_file.fp.tell()  # type: ignore[union-attr]
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
+import os
 import shutil
 import threading
-import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
-from typing import Optional
+from typing import Callable
 
 from ..core.config import Settings
 from .job_store import JobStore
@@ -20,12 +20,14 @@ class CleanupThread(threading.Thread):
         store: JobStore,
         *,
         interval_seconds: int = 60,
+        delete_workers: int = 2,
     ) -> None:
         super().__init__(daemon=True, name="job-cleanup")
         self._settings = settings
         self._store = store
         self._interval = interval_seconds
         self._stop_event = threading.Event()
+        self._deleter = ThreadPoolExecutor(max_workers=delete_workers, thread_name_prefix="cleanup")
 
     def run(self) -> None:  # noqa: D401 - Thread loop
         while not self._stop_event.wait(self._interval):
@@ -33,19 +35,33 @@ class CleanupThread(threading.Thread):
 
     def stop(self) -> None:
         self._stop_event.set()
+        # Let an in-progress _prune finish submitting before the executor refuses new work.
+        if self.is_alive():
+            self.join()
+        self._deleter.shutdown(wait=False, cancel_futures=True)
 
     def _prune(self) -> None:
         cutoff = datetime.now(tz=timezone.utc) - timedelta(seconds=self._settings.job_ttl_seconds)
-        stale_jobs = self._store.list_stale_jobs(cutoff)
-        for job in stale_jobs:
-            job_dir: Optional[Path] = None
-            if job.artifact_path:
-                job_dir = job.artifact_path.parent
-            else:
-                job_dir = self._settings.jobs_root / job.job_id
-            try:
-                shutil.rmtree(job_dir, ignore_errors=True)
-            except Exception:
-                pass
-            self._store.remove(job.job_id)
+        stale_ids = {job.job_id for job in self._store.list_stale_jobs(cutoff)}
+        # List directories before reading the known ids: any directory seen here belongs
+        # to a job created earlier, so a live job is never mistaken for an orphan.
+        with os.scandir(self._settings.jobs_root) as entries:
+            job_dirs = {entry.name: entry.path for entry in entries if entry.is_dir(follow_symlinks=False)}
+        known_ids = self._store.job_ids()
 
+        for name, path in job_dirs.items():
+            if self._stop_event.is_set():
+                return
+            if name in stale_ids:
+                future = self._deleter.submit(shutil.rmtree, path, ignore_errors=True)
+                future.add_done_callback(self._remove_job_callback(name))
+            elif name not in known_ids:
+                self._deleter.submit(shutil.rmtree, path, ignore_errors=True)
+
+        self._store.remove_many(stale_ids - job_dirs.keys())
+
+    def _remove_job_callback(self, job_id: str) -> Callable[[Future], None]:
+        def remove(_: Future) -> None:
+            self._store.remove(job_id)
+
+        return remove
@@ -1,15 +1,35 @@
 from __future__ import annotations
 
-import copy
+import os
+import time
+from bisect import bisect_left, insort
+from collections import deque
 from datetime import datetime, timedelta, timezone
+from itertools import islice
 from threading import Event, Lock
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Hashable, Iterable, List, Optional
 from uuid import uuid4
 
-from ..models.job import Job, JobStatus, LogEntry
+from ..models.job import Job, JobStatus, LogEntry, utc_from_ns
 from .token_store import TokenStore
 
+_ACTIVE_STATUSES = frozenset({JobStatus.QUEUED, JobStatus.RUNNING})
+# Finished jobs that the cleanup sweep expires by age.
+_EXPIRING_STATUSES = frozenset({JobStatus.SUCCEEDED, JobStatus.FAILED})
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _newest(logs: deque[LogEntry], count: int) -> list[LogEntry]:
+    """Return the last `count` entries, oldest first, walking in from the right end.
+
+    Pollers almost always want the newest few entries, so this never steps over
+    the older entries on the left the way `islice(logs, start, None)` does.
+    """
+    if count <= 0:
+        return []
+    return list(islice(reversed(logs), count))[::-1]
+
 
 class JobStore:
     """In-memory storage for job state and logs."""
@@ -21,47 +41,99 @@ class JobStore:
         self._ttl_seconds = ttl_seconds
         self._tokens = token_store
         self._cancel_events: Dict[str, Event] = {}
-
-    def _utcnow(self) -> datetime:
-        return datetime.now(tz=timezone.utc)
+        # job_id -> (cache key, expiry of the embedded download URL, encoded view)
+        self._view_cache: Dict[str, tuple[tuple, Optional[datetime], bytes]] = {}
+        # Queued/running jobs, kept in step with _set_status so admission checks are O(1).
+        self._active_jobs: set[str] = set()
+        # session_id -> active job ids; a dict used as an insertion-ordered set so the
+        # oldest active job is reported first.
+        self._active_by_session: Dict[str, Dict[str, None]] = {}
+        # Succeeded/failed jobs as sorted (updated_at_ns, job_id) pairs for the TTL sweep.
+        # Keys can lag behind later log appends; list_stale_jobs re-checks and re-keys them.
+        self._expiring_by_time: list[tuple[int, str]] = []
+        self._expiring_keys: Dict[str, int] = {}
 
     def create(self, theme_url: str, session_id: str) -> Job:
-        now = self._utcnow()
+        return self.create_with_logs(theme_url, session_id, [])
+
+    def create_with_logs(self, theme_url: str, session_id: str, entries: list[tuple[str, str]]) -> Job:
+        """Create a job seeded with `(level, message)` log entries and return its snapshot."""
+        now_ns = time.time_ns()
         job = Job(
             job_id=str(uuid4()),
             theme_url=theme_url,
             session_id=session_id,
             status=JobStatus.QUEUED,
-            created_at=now,
-            updated_at=now,
+            created_at=utc_from_ns(now_ns),
+            updated_at_ns=now_ns,
+            # Bounded so old entries fall off the left as new ones arrive.
+            logs=deque(maxlen=self._log_limit),
         )
+        self._extend_logs(job, entries, now_ns)
         with self._lock:
             self._jobs[job.job_id] = job
             self._cancel_events[job.job_id] = Event()
-        return copy.deepcopy(job)
+            self._set_status(job, JobStatus.QUEUED)
+            return job._fast_clone()
 
     def snapshot(self, job_id: str) -> Optional[Job]:
         with self._lock:
             job = self._jobs.get(job_id)
-            return copy.deepcopy(job) if job else None
+            return job._fast_clone() if job else None
+
+    def get_status(self, job_id: str) -> Optional[JobStatus]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.status if job else None
+
+    def cached_view(self, job_id: str, session_id: str, variant: Hashable, now: datetime) -> Optional[bytes]:
+        """Return the encoded view cached by `cache_view` if the job is unchanged since."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            cached = self._view_cache.get(job_id)
+            if job is None or cached is None or job.session_id != session_id:
+                return None
+            key, valid_until, payload = cached
+            if key != (job.updated_at_ns, job.next_cursor, variant):
+                return None
+        if valid_until is not None and valid_until <= now:
+            return None
+        return payload
+
+    def cache_view(
+        self,
+        job: Job,
+        variant: Hashable,
+        payload: bytes,
+        valid_until: Optional[datetime] = None,
+    ) -> None:
+        """Cache an encoded view of a snapshot; stale once the live job moves past it."""
+        key = (job.updated_at_ns, job.next_cursor, variant)
+        with self._lock:
+            if job.job_id in self._jobs:
+                self._view_cache[job.job_id] = (key, valid_until, payload)
 
     def mark_running(self, job_id: str) -> None:
         with self._lock:
             job = self._get(job_id)
-            job.status = JobStatus.RUNNING
-            job.updated_at = self._utcnow()
+            job.updated_at_ns = time.time_ns()
+            self._set_status(job, JobStatus.RUNNING)
+            self._view_cache.pop(job_id, None)
 
     def mark_succeeded(self, job_id: str, artifact_path: Path) -> None:
-        size: Optional[int] = None
-        if artifact_path.exists():
-            size = artifact_path.stat().st_size
+        size: Optional[int]
+        try:
+            size = os.stat(artifact_path).st_size
+        except FileNotFoundError:
+            size = None
         if size is not None and size < 100 * 1024:
             self.mark_failed(job_id, "Final archive was too small; preview may not be rippable")
             return
         with self._lock:
             job = self._get(job_id)
-            job.status = JobStatus.SUCCEEDED
-            job.updated_at = self._utcnow()
+            job.updated_at_ns = time.time_ns()
+            self._set_status(job, JobStatus.SUCCEEDED)
+            self._view_cache.pop(job_id, None)
             job.artifact_path = artifact_path
             job.download_size = size
             job.expires_at = job.updated_at + timedelta(seconds=self._ttl_seconds)
@@ -70,20 +142,23 @@ class JobStore:
     def mark_failed(self, job_id: str, error: str) -> None:
         with self._lock:
             job = self._get(job_id)
-            job.status = JobStatus.FAILED
+            job.updated_at_ns = time.time_ns()
+            self._set_status(job, JobStatus.FAILED)
             job.error = error
-            job.updated_at = self._utcnow()
+            self._view_cache.pop(job_id, None)
             job.expires_at = job.updated_at + timedelta(seconds=self._ttl_seconds)
+            # Failed jobs have no artifact, so they never get a download token.
             job.download_token = None
-            job.download_token = self._tokens.issue_token(job_id, job.expires_at)
             job.cancel_requested = False
             job.download_size = None
+        self._tokens.delete_for_job(job_id)
 
     def mark_cancelled(self, job_id: str) -> None:
         with self._lock:
             job = self._get(job_id)
-            job.status = JobStatus.CANCELLED
-            job.updated_at = self._utcnow()
+            job.updated_at_ns = time.time_ns()
+            self._set_status(job, JobStatus.CANCELLED)
+            self._view_cache.pop(job_id, None)
             job.cancel_requested = True
             job.artifact_path = None
             job.error = None
@@ -92,50 +167,64 @@ class JobStore:
         self._tokens.delete_for_job(job_id)
 
     def append_log(self, job_id: str, level: str, message: str) -> LogEntry:
-        entry = LogEntry(
-            cursor=0,
-            timestamp=self._utcnow(),
-            level=level,
-            message=message,
-        )
+        timestamp_ns = time.time_ns()
+        timestamp = utc_from_ns(timestamp_ns)
         with self._lock:
             job = self._get(job_id)
-            entry.cursor = job.next_cursor
+            entry = LogEntry(
+                cursor=job.next_cursor,
+                timestamp=timestamp,
+                level=level,
+                message=message,
+            )
             job.logs.append(entry)
+            job.log_tail.append(entry)
             job.next_cursor += 1
-            job.updated_at = entry.timestamp
-            if len(job.logs) > self._log_limit:
-                job.logs = job.logs[-self._log_limit :]
+            job.updated_at_ns = timestamp_ns
+            self._view_cache.pop(job_id, None)
         return entry
 
+    def append_logs_bulk(self, job_id: str, entries: list[tuple[str, str]]) -> Optional[int]:
+        """Append several `(level, message)` pairs under a single lock acquisition.
+
+        All entries share one timestamp. Returns the cursor of the last entry, or None if
+        `entries` is empty.
+        """
+        if not entries:
+            return None
+        timestamp_ns = time.time_ns()
+        with self._lock:
+            job = self._get(job_id)
+            self._extend_logs(job, entries, timestamp_ns)
+            self._view_cache.pop(job_id, None)
+            return job.next_cursor - 1
+
     def get_logs_since(self, job_id: str, since: int) -> tuple[list[LogEntry], int, bool]:
         with self._lock:
             job = self._get(job_id)
-            entries = [log for log in job.logs if log.cursor >= since]
-            truncated = bool(entries) and entries[0].cursor > since
-            has_more = truncated or (bool(entries) and entries[-1].cursor < job.next_cursor - 1)
-            return copy.deepcopy(entries), job.next_cursor, has_more
+            # Cursors are contiguous, so the first wanted entry sits at a fixed offset.
+            first_cursor = job.logs[0].cursor if job.logs else job.next_cursor
+            start = max(0, since - first_cursor)
+            entries = _newest(job.logs, len(job.logs) - start)
+            next_cursor = job.next_cursor
+        truncated = bool(entries) and entries[0].cursor > since
+        has_more = truncated or (bool(entries) and entries[-1].cursor < next_cursor - 1)
+        return entries, next_cursor, has_more
 
     def tail(self, job_id: str, limit: int) -> tuple[list[LogEntry], int]:
         with self._lock:
             job = self._get(job_id)
-            entries = job.logs[-limit:]
-            return copy.deepcopy(entries), job.next_cursor
+            return _newest(job.logs, limit), job.next_cursor
 
     def active_count(self) -> int:
         with self._lock:
-            return sum(
-                1
-                for job in self._jobs.values()
-                if job.status in (JobStatus.QUEUED, JobStatus.RUNNING)
-            )
+            return len(self._active_jobs)
 
     def active_job_for_session(self, session_id: str) -> Optional[Job]:
         with self._lock:
-            for job in self._jobs.values():
-                if job.session_id == session_id and job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
-                    return copy.deepcopy(job)
-        return None
+            job_ids = self._active_by_session.get(session_id)
+            job = self._jobs[next(iter(job_ids))] if job_ids else None
+            return job._fast_clone() if job else None
 
     def request_cancel(self, job_id: str) -> bool:
         with self._lock:
@@ -148,31 +237,107 @@ class JobStore:
             job.cancel_requested = True
             event.set()
             if job.status == JobStatus.QUEUED:
-                job.status = JobStatus.CANCELLED
-                job.updated_at = self._utcnow()
+                job.updated_at_ns = time.time_ns()
+                self._set_status(job, JobStatus.CANCELLED)
+                self._view_cache.pop(job_id, None)
             return True
 
-    def is_cancelled(self, job_id: str) -> bool:
+    def get_cancel_event(self, job_id: str) -> Event:
+        """Return the job's cancellation event so callers can poll it without the store lock.
+
+        Unknown jobs get an already-set event, matching `remove`, which sets the event
+        of the job it drops.
+        """
         with self._lock:
             event = self._cancel_events.get(job_id)
-            return event.is_set() if event else False
+        if event is None:
+            event = Event()
+            event.set()
+        return event
 
     def list_stale_jobs(self, cutoff: datetime) -> List[Job]:
+        cutoff_ns = (cutoff - _EPOCH) // timedelta(microseconds=1) * 1000
+        with self._lock:
+            end = bisect_left(self._expiring_by_time, (cutoff_ns + 1, ""))
+            stale: List[Job] = []
+            lagging: List[Job] = []
+            for _, job_id in self._expiring_by_time[:end]:
+                job = self._jobs[job_id]
+                if job.updated_at_ns <= cutoff_ns:
+                    stale.append(job._fast_clone())
+                else:
+                    lagging.append(job)
+            for job in lagging:
+                self._unindex_expiring(job.job_id)
+                self._index_expiring(job)
+            return stale
+
+    def job_ids(self) -> set[str]:
         with self._lock:
-            return [
-                copy.deepcopy(job)
-                for job in self._jobs.values()
-                if job.status in (JobStatus.SUCCEEDED, JobStatus.FAILED) and job.updated_at <= cutoff
-            ]
+            return set(self._jobs)
 
     def remove(self, job_id: str) -> None:
         with self._lock:
-            self._jobs.pop(job_id, None)
+            job = self._jobs.pop(job_id, None)
+            if job is not None:
+                self._deactivate(job)
+            self._unindex_expiring(job_id)
+            self._view_cache.pop(job_id, None)
             event = self._cancel_events.pop(job_id, None)
         self._tokens.delete_for_job(job_id)
         if event is not None:
             event.set()
 
+    def _extend_logs(self, job: Job, entries: list[tuple[str, str]], timestamp_ns: int) -> None:
+        if not entries:
+            return
+        timestamp = utc_from_ns(timestamp_ns)
+        start = job.next_cursor
+        new_entries = [
+            LogEntry(cursor=cursor, timestamp=timestamp, level=level, message=message)
+            for cursor, (level, message) in zip(range(start, start + len(entries)), entries)
+        ]
+        job.logs.extend(new_entries)
+        job.log_tail.extend(new_entries)
+        job.next_cursor = start + len(new_entries)
+        job.updated_at_ns = timestamp_ns
+
+    def _set_status(self, job: Job, status: JobStatus) -> None:
+        """Change a job's status, keeping the active-job indexes in step. Caller holds the lock."""
+        job.status = status
+        if status in _ACTIVE_STATUSES:
+            self._active_jobs.add(job.job_id)
+            self._active_by_session.setdefault(job.session_id, {})[job.job_id] = None
+            return
+        self._deactivate(job)
+        if status not in _EXPIRING_STATUSES:
+            self._unindex_expiring(job.job_id)
+        elif job.job_id not in self._expiring_keys:
+            self._index_expiring(job)
+
+    def _deactivate(self, job: Job) -> None:
+        self._active_jobs.discard(job.job_id)
+        session_jobs = self._active_by_session.get(job.session_id)
+        if session_jobs is not None:
+            session_jobs.pop(job.job_id, None)
+            if not session_jobs:
+                del self._active_by_session[job.session_id]
+
+    def _index_expiring(self, job: Job) -> None:
+        insort(self._expiring_by_time, (job.updated_at_ns, job.job_id))
+        self._expiring_keys[job.job_id] = job.updated_at_ns
+
+    def _unindex_expiring(self, job_id: str) -> None:
+        key = self._expiring_keys.pop(job_id, None)
+        if key is not None:
+            del self._expiring_by_time[bisect_left(self._expiring_by_time, (key, job_id))]
+
+    def remove_many(self, job_ids: Iterable[str]) -> None:
+        """Remove several jobs, committing their token deletions together."""
+        with self._tokens.batch():
+            for job_id in job_ids:
+                self.remove(job_id)
+
     def _get(self, job_id: str) -> Job:
         try:
             return self._jobs[job_id]
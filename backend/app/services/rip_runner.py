@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import os
+import queue
+import re
+import selectors
 import shutil
 import subprocess
-from contextlib import suppress
+from contextlib import contextmanager, suppress
 from pathlib import Path
-from typing import Callable
+from threading import Event, Semaphore
+from typing import Callable, Iterator
 from urllib.parse import urlparse
-from zipfile import ZIP_DEFLATED, ZipFile
 
 from selenium import webdriver
 from selenium.common.exceptions import WebDriverException
@@ -17,9 +21,29 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
 from ..core.config import Settings
+from .archive import create_archive
 from .job_store import JobStore
 
 
+WGET_POLL_SECONDS = 0.25
+WGET_READ_BYTES = 65536
+# wget2 accepts the same mirroring flags as wget but fetches over parallel connections.
+WGET2_MAX_THREADS = 16
+
+# The wget output shapes worth logging, classified in one pass. Anything else is noise.
+_WGET_RE = re.compile(
+    r"\s*(?:"
+    r"(?P<error>error.*?)"
+    r"|--(?:.*?--\s*(?P<url>\S.*?)|.*)"
+    r"|\[\d+\]\s+downloading\s+'(?P<wget2_url>[^']+)'.*"
+    r"|saving\s+'(?P<saved_path>[^']+)'.*"
+    r"|(?P<saving>saving to:).*"
+    r"|(?P<skip>.*not retrieving.*?)"
+    r")\s*",
+    re.IGNORECASE,
+)
+
+
 class JobCancelled(Exception):
     """Raised when a job cancellation is requested."""
 
@@ -30,36 +54,51 @@ class RipRunner:
     def __init__(self, settings: Settings, store: JobStore) -> None:
         self._settings = settings
         self._store = store
+        # Idle drivers ready for reuse; the semaphore caps live Chrome instances.
+        self._idle_drivers: queue.SimpleQueue[webdriver.Chrome] = queue.SimpleQueue()
+        self._driver_slots = Semaphore(settings.max_concurrent_drivers)
 
     def run(self, job_id: str, theme_url: str) -> None:
         storage_dir = self._settings.jobs_root / job_id
         mirror_dir = storage_dir / "mirror"
+        # Fetched once; is_set() needs no JobStore lock.
+        cancel_event = self._store.get_cancel_event(job_id)
 
         try:
-            self._ensure_not_cancelled(job_id)
+            self._ensure_not_cancelled(cancel_event)
             self._store.mark_running(job_id)
-            self._ensure_not_cancelled(job_id)
+            self._ensure_not_cancelled(cancel_event)
             self._store.append_log(job_id, "info", "Job accepted, starting extraction")
 
             mirror_dir.mkdir(parents=True, exist_ok=True)
 
-            if "full_screen_preview" in theme_url:
-                preview_url = theme_url
-                self._store.append_log(job_id, "info", "Input URL already points to preview; skipping lookup")
-            else:
-                self._ensure_not_cancelled(job_id)
-                preview_url = self._with_driver(
-                    "Resolve preview URL", job_id, lambda driver: self._get_preview_url(driver, theme_url)
-                )
-                self._store.append_log(job_id, "info", f"Resolved preview URL {preview_url}")
+            self._ensure_not_cancelled(cancel_event)
+            with self._driver_ctx(job_id) as driver:
+                if "full_screen_preview" in theme_url:
+                    preview_url = theme_url
+                    self._store.append_log(job_id, "info", "Input URL already points to preview; skipping lookup")
+                else:
+                    preview_url = self._with_driver(
+                        "Resolve preview URL",
+                        job_id,
+                        cancel_event,
+                        driver,
+                        lambda d: self._get_preview_url(d, theme_url),
+                    )
+                    self._store.append_log(job_id, "info", f"Resolved preview URL {preview_url}")
 
-            self._ensure_not_cancelled(job_id)
-            full_frame_url = self._with_driver("Resolve full frame URL", job_id, lambda driver: self._get_full_frame_url(driver, preview_url))
-            self._store.append_log(job_id, "info", f"Resolved frame URL {full_frame_url}")
+                full_frame_url = self._with_driver(
+                    "Resolve full frame URL",
+                    job_id,
+                    cancel_event,
+                    driver,
+                    lambda d: self._get_full_frame_url(d, preview_url),
+                )
+                self._store.append_log(job_id, "info", f"Resolved frame URL {full_frame_url}")
 
-            self._ensure_not_cancelled(job_id)
-            self._mirror_site(job_id, full_frame_url, mirror_dir)
-            self._ensure_not_cancelled(job_id)
+            self._ensure_not_cancelled(cancel_event)
+            self._mirror_site(job_id, full_frame_url, mirror_dir, cancel_event)
+            self._ensure_not_cancelled(cancel_event)
 
             zip_path = self._create_archive(storage_dir, mirror_dir, job_id)
             self._store.append_log(job_id, "info", f"Created archive {zip_path.name}")
@@ -81,16 +120,69 @@ class RipRunner:
                 shutil.rmtree(storage_dir, ignore_errors=True)
             raise
 
-    def _with_driver(self, description: str, job_id: str, func: Callable[[webdriver.Chrome], str]) -> str:
-        driver = self._build_driver(job_id)
+    def close(self) -> None:
+        """Quit every idle pooled driver."""
+        while True:
+            try:
+                driver = self._idle_drivers.get_nowait()
+            except queue.Empty:
+                return
+            with suppress(Exception):
+                driver.quit()
+
+    @contextmanager
+    def _driver_ctx(self, job_id: str) -> Iterator[webdriver.Chrome]:
+        """Lend a Chrome driver for the block, reusing an idle one when available.
+
+        The driver goes back to the pool only if the block succeeds and the browser
+        resets cleanly; otherwise it is quit, since its state is unknown.
+        """
+        with self._driver_slots:
+            driver = self._checkout_idle_driver() or self._build_driver(job_id)
+            try:
+                yield driver
+            except BaseException:
+                with suppress(Exception):
+                    driver.quit()
+                raise
+            try:
+                driver.delete_all_cookies()
+                driver.get("about:blank")
+            except WebDriverException:
+                with suppress(Exception):
+                    driver.quit()
+                return
+            self._idle_drivers.put(driver)
+
+    def _checkout_idle_driver(self) -> webdriver.Chrome | None:
+        """Return a live idle driver, quitting any whose browser died while pooled."""
+        while True:
+            try:
+                driver = self._idle_drivers.get_nowait()
+            except queue.Empty:
+                return None
+            try:
+                driver.current_url
+            except WebDriverException:
+                with suppress(Exception):
+                    driver.quit()
+                continue
+            return driver
+
+    def _with_driver(
+        self,
+        description: str,
+        job_id: str,
+        cancel_event: Event,
+        driver: webdriver.Chrome,
+        func: Callable[[webdriver.Chrome], str],
+    ) -> str:
         try:
             self._store.append_log(job_id, "info", f"{description}")
-            self._ensure_not_cancelled(job_id)
+            self._ensure_not_cancelled(cancel_event)
             return func(driver)
         except WebDriverException as exc:
             raise RuntimeError(f"{description} failed: {exc.msg}") from exc
-        finally:
-            driver.quit()
 
     def _build_driver(self, job_id: str) -> webdriver.Chrome:
         options = ChromeOptions()
@@ -146,52 +238,81 @@ class RipRunner:
         )
         return frame.get_attribute("src")
 
-    def _mirror_site(self, job_id: str, full_frame_url: str, dest_dir: Path) -> None:
+    def _mirror_site(self, job_id: str, full_frame_url: str, dest_dir: Path, cancel_event: Event) -> None:
+        program = "wget2" if shutil.which("wget2") else "wget"
         command = [
-            "wget",
+            program,
             "-e",
             "robots=off",
             "-P",
             str(dest_dir),
             "-m",
-            full_frame_url,
         ]
+        if program == "wget2":
+            command.append(f"--max-threads={WGET2_MAX_THREADS}")
+        command.append(full_frame_url)
         self._store.append_log(job_id, "info", f"Running {' '.join(command[:5])} ...")
         try:
             with subprocess.Popen(
                 command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-            ) as process:
+                bufsize=0,
+            ) as process, selectors.DefaultSelector() as selector:
                 assert process.stdout is not None
+                fd = process.stdout.fileno()
+                os.set_blocking(fd, False)
+                # epoll/poll where available: select() fails once fds pass FD_SETSIZE,
+                # which a long-lived server can reach.
+                selector.register(fd, selectors.EVENT_READ)
+                pending = b""
                 last_url: str | None = None
-                for line in process.stdout:
-                    if self._store.is_cancelled(job_id):
+                while True:
+                    # Wake at least every WGET_POLL_SECONDS so cancellation is noticed
+                    # even while wget is quiet, and check it once per wakeup.
+                    readable = selector.select(WGET_POLL_SECONDS)
+                    if cancel_event.is_set():
                         process.terminate()
                         with suppress(subprocess.TimeoutExpired):
                             process.wait(timeout=5)
                         raise JobCancelled
-                    entries, last_url = self._simplify_wget_line(line, last_url)
-                    for level, message in entries:
-                        self._store.append_log(job_id, level, message)
+                    if not readable:
+                        continue
+                    try:
+                        chunk = os.read(fd, WGET_READ_BYTES)
+                    except BlockingIOError:
+                        continue
+                    if not chunk:
+                        break
+                    *lines, pending = (pending + chunk).split(b"\n")
+                    last_url = self._log_wget_lines(job_id, lines, last_url)
+                if pending:
+                    self._log_wget_lines(job_id, [pending], last_url)
                 retcode = process.wait()
-                if self._store.is_cancelled(job_id):
+                if cancel_event.is_set():
                     raise JobCancelled
                 if retcode == 8:
                     self._store.append_log(
                         job_id,
                         "warn",
-                        "wget completed with HTTP errors (some assets may be missing)",
+                        f"{program} completed with HTTP errors (some assets may be missing)",
                     )
                 elif retcode != 0:
-                    raise RuntimeError(f"wget exited with code {retcode}")
+                    raise RuntimeError(f"{program} exited with code {retcode}")
         except FileNotFoundError as exc:
             raise RuntimeError("wget is required but not installed or not in PATH") from exc
 
-    def _ensure_not_cancelled(self, job_id: str) -> None:
-        if self._store.is_cancelled(job_id):
+    def _log_wget_lines(self, job_id: str, lines: list[bytes], last_url: str | None) -> str | None:
+        batch: list[tuple[str, str]] = []
+        for raw_line in lines:
+            entries, last_url = self._simplify_wget_line(raw_line.decode("utf-8", errors="replace"), last_url)
+            batch.extend(entries)
+        self._store.append_logs_bulk(job_id, batch)
+        return last_url
+
+    @staticmethod
+    def _ensure_not_cancelled(cancel_event: Event) -> None:
+        if cancel_event.is_set():
             raise JobCancelled
 
     def _create_archive(self, storage_dir: Path, source_dir: Path, job_id: str) -> Path:
@@ -199,10 +320,7 @@ class RipRunner:
         if archive_path.exists():
             archive_path.unlink()
 
-        with ZipFile(archive_path, mode="w", compression=ZIP_DEFLATED) as zip_file:
-            for file_path in source_dir.rglob("*"):
-                if file_path.is_file():
-                    zip_file.write(file_path, file_path.relative_to(source_dir))
+        create_archive(archive_path, source_dir)
         return archive_path
 
     def _simplify_wget_line(
@@ -210,33 +328,27 @@ class RipRunner:
         raw_line: str,
         last_url: str | None,
     ) -> tuple[list[tuple[str, str]], str | None]:
-        line = raw_line.strip()
-        if not line:
+        match = _WGET_RE.fullmatch(raw_line)
+        if match is None:
             return [], last_url
 
-        uppercase = line.upper()
-        if uppercase.startswith("ERROR"):
-            return [("error", line)], last_url
-
-        if line.startswith("--"):
-            parts = line.split("--", 2)
-            if len(parts) >= 3:
-                url = parts[2].strip()
-                if url:
-                    label = self._resource_label(url)
-                    return [("info", f"Fetching {label}")], url
-            return [], last_url
-
-        lowered = line.lower()
-        if lowered.startswith("saving to:"):
+        error, url, wget2_url, saved_path, saving, skip = match.group(
+            "error", "url", "wget2_url", "saved_path", "saving", "skip"
+        )
+        if error:
+            return [("error", error)], last_url
+        url = url or wget2_url
+        if url:
+            return [("info", f"Fetching {self._resource_label(url)}")], url
+        if saved_path:
+            # wget2 names the file itself; its parallel downloads make last_url unreliable.
+            return [("info", f"Saved {Path(saved_path).name}")], last_url
+        if saving:
             if last_url:
-                label = self._resource_label(last_url)
-                return [("info", f"Saved {label}")], last_url
+                return [("info", f"Saved {self._resource_label(last_url)}")], last_url
             return [], last_url
-
-        if "not retrieving" in lowered:
-            return [("warn", line)], last_url
-
+        if skip:
+            return [("warn", skip)], last_url
         return [], last_url
 
     @staticmethod
@@ -1,83 +1,136 @@
 from __future__ import annotations
 
 import sqlite3
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from threading import Lock
-from typing import Optional
+from typing import Dict, Iterator, Optional
 from uuid import uuid4
 
+# Kept as module constants so sqlite3's statement cache reuses the prepared statements.
+_SQL_CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS download_tokens (
+        token TEXT PRIMARY KEY,
+        job_id TEXT NOT NULL,
+        expires_at INTEGER NOT NULL
+    )
+"""
+_SQL_CREATE_JOB_INDEX = "CREATE INDEX IF NOT EXISTS idx_download_tokens_job_id ON download_tokens(job_id)"
+_SQL_SELECT_ALL = "SELECT token, job_id, expires_at FROM download_tokens"
+_SQL_INSERT = "INSERT INTO download_tokens(token, job_id, expires_at) VALUES (?, ?, ?)"
+_SQL_DELETE_TOKEN = "DELETE FROM download_tokens WHERE token = ?"
+_SQL_DELETE_JOB = "DELETE FROM download_tokens WHERE job_id = ?"
+_SQL_DELETE_EXPIRED = "DELETE FROM download_tokens WHERE expires_at < ?"
+
 
 class TokenStore:
-    """SQLite-backed storage for download tokens."""
+    """SQLite-backed storage for download tokens.
+
+    Live tokens are mirrored in memory so lookups never touch the database;
+    SQLite only persists them.
+    """
 
     def __init__(self, db_path: Path) -> None:
         self._db_path = db_path
         self._lock = Lock()
         self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
-        self._conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS download_tokens (
-                token TEXT PRIMARY KEY,
-                job_id TEXT NOT NULL,
-                expires_at TEXT NOT NULL
-            )
-            """
-        )
-        self._conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_download_tokens_job_id ON download_tokens(job_id)"
-        )
+        # WAL with synchronous=NORMAL commits without an fsync per write.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._batch_depth = 0
+        self._conn.execute(_SQL_CREATE_TABLE)
+        self._conn.execute(_SQL_CREATE_JOB_INDEX)
+        self._conn.commit()
+        # token -> (job_id, expiry, expiry as unix seconds for cheap comparisons)
+        self._live: Dict[str, tuple[str, datetime, int]] = {}
+        self._job_tokens: Dict[str, str] = {}
+        self._load_live_tokens()
+
+    def _load_live_tokens(self) -> None:
+        now = int(time.time())
+        # Drop rows that will never be loaded, so the in-memory maps cover the whole table.
+        self._conn.execute(_SQL_DELETE_EXPIRED, (now,))
         self._conn.commit()
+        for token, job_id, expires_ts in self._conn.execute(_SQL_SELECT_ALL).fetchall():
+            if expires_ts >= now:
+                self._live[token] = (job_id, datetime.fromtimestamp(expires_ts, tz=timezone.utc), expires_ts)
+                self._job_tokens[job_id] = token
 
     def issue_token(self, job_id: str, expires_at: datetime) -> str:
         """Return an existing valid token for the job or create a new one."""
         with self._lock:
-            token = self._get_valid_token(job_id, expires_at)
+            token = self._get_valid_token(job_id)
             if token:
                 return token
             token = uuid4().hex
-            self._conn.execute(
-                "INSERT INTO download_tokens(token, job_id, expires_at) VALUES (?, ?, ?)",
-                (token, job_id, expires_at.isoformat()),
-            )
-            self._conn.commit()
+            expires_ts = int(expires_at.timestamp())
+            self._conn.execute(_SQL_INSERT, (token, job_id, expires_ts))
+            self._commit()
+            self._live[token] = (job_id, expires_at, expires_ts)
+            self._job_tokens[job_id] = token
             return token
 
-    def _get_valid_token(self, job_id: str, expires_at: datetime) -> Optional[str]:
-        row = self._conn.execute(
-            "SELECT token, expires_at FROM download_tokens WHERE job_id = ?", (job_id,)
-        ).fetchone()
-        if not row:
+    def _get_valid_token(self, job_id: str) -> Optional[str]:
+        token = self._job_tokens.get(job_id)
+        if token is None:
             return None
-        token, stored_expiry = row
-        expiry_dt = datetime.fromisoformat(stored_expiry)
-        if expiry_dt >= datetime.now(tz=timezone.utc):
+        if self._live[token][2] >= int(time.time()):
             return token
         # Expired; replace with new record
-        self._conn.execute("DELETE FROM download_tokens WHERE job_id = ?", (job_id,))
-        self._conn.commit()
+        self._delete_for_job(job_id)
         return None
 
     def resolve(self, token: str) -> Optional[tuple[str, datetime]]:
-        row = self._conn.execute(
-            "SELECT job_id, expires_at FROM download_tokens WHERE token = ?", (token,)
-        ).fetchone()
-        if not row:
-            return None
-        job_id, expires_at = row
-        expiry_dt = datetime.fromisoformat(expires_at)
-        if expiry_dt < datetime.now(tz=timezone.utc):
-            self.delete_token(token)
-            return None
-        return job_id, expiry_dt
+        with self._lock:
+            entry = self._live.get(token)
+            if entry is None:
+                return None
+            job_id, expires_at, expires_ts = entry
+            if expires_ts < time.time():
+                self._delete_token(token)
+                return None
+            return job_id, expires_at
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Commit all writes made inside the block as one transaction."""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._conn.commit()
 
     def delete_token(self, token: str) -> None:
         with self._lock:
-            self._conn.execute("DELETE FROM download_tokens WHERE token = ?", (token,))
-            self._conn.commit()
+            self._delete_token(token)
 
     def delete_for_job(self, job_id: str) -> None:
         with self._lock:
-            self._conn.execute("DELETE FROM download_tokens WHERE job_id = ?", (job_id,))
+            self._delete_for_job(job_id)
+
+    def _commit(self) -> None:
+        if self._batch_depth == 0:
             self._conn.commit()
 
+    def _delete_token(self, token: str) -> None:
+        self._conn.execute(_SQL_DELETE_TOKEN, (token,))
+        self._commit()
+        entry = self._live.pop(token, None)
+        if entry is not None and self._job_tokens.get(entry[0]) == token:
+            del self._job_tokens[entry[0]]
+
+    def _delete_for_job(self, job_id: str) -> None:
+        token = self._job_tokens.pop(job_id, None)
+        if token is None:
+            # Every row inserted by this process is mirrored in memory; nothing to delete.
+            return
+        self._live.pop(token, None)
+        self._conn.execute(_SQL_DELETE_JOB, (job_id,))
+        self._commit()